@@ -2,57 +2,22 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 import sqlite3
+import calendar
 from datetime import datetime
 
+import db
+import history
+import reports
+
 combo_view_class = None
 combo_view_section = None
 combo_view_student = None
 
 
 # -------------------- Database Setup --------------------
-DB = "attendance.db"
-conn = sqlite3.connect(DB)
+conn = db.connect(db.DB)
 cur = conn.cursor()
 
-# Tables
-cur.execute('''
-CREATE TABLE IF NOT EXISTS classes(
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    class_name TEXT NOT NULL UNIQUE
-)
-''')
-
-cur.execute('''
-CREATE TABLE IF NOT EXISTS sections(
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    class_id INTEGER NOT NULL,
-    section_name TEXT NOT NULL,
-    FOREIGN KEY(class_id) REFERENCES classes(id)
-)
-''')
-
-cur.execute('''
-CREATE TABLE IF NOT EXISTS students(
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT NOT NULL,
-    class_id INTEGER NOT NULL,
-    section_id INTEGER NOT NULL,
-    FOREIGN KEY(class_id) REFERENCES classes(id),
-    FOREIGN KEY(section_id) REFERENCES sections(id)
-)
-''')
-
-cur.execute('''
-CREATE TABLE IF NOT EXISTS attendance(
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    student_id INTEGER NOT NULL,
-    date TEXT NOT NULL,
-    status TEXT NOT NULL,
-    FOREIGN KEY(student_id) REFERENCES students(id)
-)
-''')
-conn.commit()
-
 # -------------------- App Setup --------------------
 root = tk.Tk()
 root.title("Attendance Management System (CRUD)")
@@ -108,7 +73,7 @@ def add_class():
         messagebox.showwarning("Input", "Enter class name.")
         return
     try:
-        cur.execute("INSERT INTO classes(class_name) VALUES(?)", (name,))
+        cur.execute(db.CLASS_INSERT, (name,))
         conn.commit()
         ent_class_name.delete(0, tk.END)
         refresh_all()
@@ -117,7 +82,7 @@ def add_class():
 
 def load_classes_table():
     tree_class.delete(*tree_class.get_children())
-    cur.execute("SELECT id, class_name FROM classes ORDER BY class_name")
+    cur.execute(db.CLASSES_LIST)
     for r in cur.fetchall():
         tree_class.insert("", tk.END, values=r)
 
@@ -130,7 +95,7 @@ def edit_class():
     new = simple_input("Edit Class", "New class name:", old)
     if new:
         try:
-            cur.execute("UPDATE classes SET class_name=? WHERE id=?", (new, cid))
+            cur.execute(db.CLASS_RENAME, (new, cid))
             conn.commit()
             refresh_all()
         except Exception as e:
@@ -145,16 +110,16 @@ def delete_class():
     if not confirm("Deleting a class will delete its sections, students and related attendance. Continue?"):
         return
     # Delete attendance for students in this class
-    cur.execute("SELECT id FROM students WHERE class_id=?", (cid,))
+    cur.execute(db.STUDENT_IDS_BY_CLASS, (cid,))
     sids = [r[0] for r in cur.fetchall()]
     if sids:
-        cur.executemany("DELETE FROM attendance WHERE student_id=?", [(sid,) for sid in sids])
+        cur.executemany(db.ATTENDANCE_DELETE_BY_STUDENT, [(sid,) for sid in sids])
     # Delete students
-    cur.execute("DELETE FROM students WHERE class_id=?", (cid,))
+    cur.execute(db.STUDENTS_DELETE_BY_CLASS, (cid,))
     # Delete sections
-    cur.execute("DELETE FROM sections WHERE class_id=?", (cid,))
+    cur.execute(db.SECTIONS_DELETE_BY_CLASS, (cid,))
     # Delete class
-    cur.execute("DELETE FROM classes WHERE id=?", (cid,))
+    cur.execute(db.CLASS_DELETE, (cid,))
     conn.commit()
     refresh_all()
 
@@ -175,7 +140,7 @@ ttk.Button(btnf, text="Delete Class", command=delete_class).grid(row=0, column=1
 
 # -------------------- SECTION CRUD --------------------
 def load_class_combos():
-    cur.execute("SELECT class_name FROM classes ORDER BY class_name")
+    cur.execute(db.CLASS_NAMES)
     classes = cur.fetchall()
     cat = [f"{r[0]}" for r in classes]
     combo_section_class['values'] = cat
@@ -194,14 +159,14 @@ def add_section():
     if not name:
         messagebox.showwarning("Input", "Enter section name.")
         return
-    cur.execute("INSERT INTO sections(class_id, section_name) VALUES(?,?)", (cid, name))
+    cur.execute(db.SECTION_INSERT, (cid, name))
     conn.commit()
     ent_section_name.delete(0, tk.END)
     refresh_all()
 
 def load_sections_table():
     tree_section.delete(*tree_section.get_children())
-    cur.execute("SELECT c.class_name, s.section_name FROM sections s JOIN classes c ON s.class_id=c.id ORDER BY c.class_name, s.section_name")
+    cur.execute(db.SECTIONS_LIST)
     for r in cur.fetchall():
         tree_section.insert("", tk.END, values=r)
 
@@ -213,7 +178,7 @@ def edit_section():
     sid, classname, old = tree_section.item(sel, "values")
     new = simple_input("Edit Section", f"New name for section (Class: {classname}):", old)
     if new:
-        cur.execute("UPDATE sections SET section_name=? WHERE id=?", (new, sid))
+        cur.execute(db.SECTION_RENAME, (new, sid))
         conn.commit()
         refresh_all()
 
@@ -225,12 +190,12 @@ def delete_section():
     sid = tree_section.item(sel, "values")[0]
     if not confirm("Deleting a section will delete its students and attendance. Continue?"):
         return
-    cur.execute("SELECT id FROM students WHERE section_id=?", (sid,))
+    cur.execute(db.STUDENT_IDS_BY_SECTION, (sid,))
     sids = [r[0] for r in cur.fetchall()]
     if sids:
-        cur.executemany("DELETE FROM attendance WHERE student_id=?", [(x,) for x in sids])
-    cur.execute("DELETE FROM students WHERE section_id=?", (sid,))
-    cur.execute("DELETE FROM sections WHERE id=?", (sid,))
+        cur.executemany(db.ATTENDANCE_DELETE_BY_STUDENT, [(x,) for x in sids])
+    cur.execute(db.STUDENTS_DELETE_BY_SECTION, (sid,))
+    cur.execute(db.SECTION_DELETE, (sid,))
     conn.commit()
     refresh_all()
 
@@ -258,7 +223,7 @@ def on_class_selected_for_student(event=None):
     if not combo_student_class.get():
         return
     cid = combo_student_class.get()
-    cur.execute("SELECT section_name FROM sections WHERE class_id=? ORDER BY section_name", (cid,))
+    cur.execute(db.SECTION_NAMES_BY_CLASS, (cid,))
     combo_student_section['values'] = [f"{r[0]}" for r in cur.fetchall()]
 
 def add_student():
@@ -271,18 +236,14 @@ def add_student():
         return
     cid = combo_student_class.get()
     sid = combo_student_section.get()
-    cur.execute("INSERT INTO students(name, class_id, section_id) VALUES(?,?,?)", (name, cid, sid))
+    cur.execute(db.STUDENT_INSERT, (name, cid, sid))
     conn.commit()
     ent_student_name.delete(0, tk.END)
     refresh_all()
 
 def load_students_table():
     tree_student.delete(*tree_student.get_children())
-    cur.execute('''SELECT s.id, s.name, c.class_name, se.section_name
-                   FROM students s
-                   JOIN classes c ON s.class_id=c.id
-                   JOIN sections se ON s.section_id=se.id
-                   ORDER BY c.class_name, se.section_name, s.name''')
+    cur.execute(db.STUDENTS_LIST)
     for r in cur.fetchall():
         tree_student.insert("", tk.END, values=r)
 
@@ -294,7 +255,7 @@ def edit_student():
     sid, oldname, *_ = tree_student.item(sel, "values")
     new = simple_input("Edit Student", "New name:", oldname)
     if new:
-        cur.execute("UPDATE students SET name=? WHERE id=?", (new, sid))
+        cur.execute(db.STUDENT_RENAME, (new, sid))
         conn.commit()
         refresh_all()
 
@@ -306,13 +267,13 @@ def delete_student():
     sid = tree_student.item(sel, "values")[0]
     if not confirm("Delete student and related attendance?"):
         return
-    cur.execute("DELETE FROM attendance WHERE student_id=?", (sid,))
-    cur.execute("DELETE FROM students WHERE id=?", (sid,))
+    cur.execute(db.ATTENDANCE_DELETE_BY_STUDENT, (sid,))
+    cur.execute(db.STUDENT_DELETE, (sid,))
     conn.commit()
     refresh_all()
 
 def refresh_class_filter():
-    cur.execute("SELECT class_name FROM classes ORDER BY class_name")
+    cur.execute(db.CLASS_NAMES)
     combo_filter_class['values'] = [r[0] for r in cur.fetchall()]
     combo_filter_class.set('')
 
@@ -321,12 +282,12 @@ def on_filter_class_selected(event=None):
     class_name = combo_filter_class.get().strip()
     if not class_name:
         return
-    cur.execute("SELECT id FROM classes WHERE class_name=?", (class_name,))
+    cur.execute(db.CLASS_ID_BY_NAME, (class_name,))
     row = cur.fetchone()
     if not row:
         return
     cid = row[0]
-    cur.execute("SELECT section_name FROM sections WHERE class_id=? ORDER BY section_name", (cid,))
+    cur.execute(db.SECTION_NAMES_BY_CLASS, (cid,))
     combo_filter_section['values'] = [r[0] for r in cur.fetchall()]
     combo_filter_section.set('')
     load_students()
@@ -338,13 +299,7 @@ def load_students():
     """Loads students according to selected filter"""
     tree_student.delete(*tree_student.get_children())
     if show_all_var.get():
-        cur.execute("""
-            SELECT s.id, s.name, c.class_name, sec.section_name
-            FROM students s
-            JOIN classes c ON s.class_id=c.id
-            JOIN sections sec ON s.section_id=sec.id
-            ORDER BY c.class_name, sec.section_name, s.name
-        """)
+        cur.execute(db.STUDENTS_LIST)
     else:
         class_name = combo_filter_class.get().strip()
         section_name = combo_filter_section.get().strip()
@@ -352,30 +307,16 @@ def load_students():
         if not class_name:
             return
 
-        cur.execute("SELECT id FROM classes WHERE class_name=?", (class_name,))
+        cur.execute(db.CLASS_ID_BY_NAME, (class_name,))
         c_row = cur.fetchone()
         if not c_row:
             return
         cid = c_row[0]
 
         if section_name:
-            cur.execute("""
-                SELECT s.id, s.name, c.class_name, sec.section_name
-                FROM students s
-                JOIN classes c ON s.class_id=c.id
-                JOIN sections sec ON s.section_id=sec.id
-                WHERE s.class_id=? AND s.section_id=(SELECT id FROM sections WHERE section_name=? AND class_id=?)
-                ORDER BY s.name
-            """, (cid, section_name, cid))
+            cur.execute(db.STUDENTS_BY_CLASS_SECTION, (cid, section_name, cid))
         else:
-            cur.execute("""
-                SELECT s.id, s.name, c.class_name, sec.section_name
-                FROM students s
-                JOIN classes c ON s.class_id=c.id
-                JOIN sections sec ON s.section_id=sec.id
-                WHERE s.class_id=?
-                ORDER BY sec.section_name, s.name
-            """, (cid,))
+            cur.execute(db.STUDENTS_BY_CLASS, (cid,))
 
     for r in cur.fetchall():
         tree_student.insert("", tk.END, values=r)
@@ -442,7 +383,7 @@ def on_att_class_selected(event=None):
     if not combo_att_class.get():
         return
     cid = combo_att_class.get()
-    cur.execute("SELECT section_name FROM sections WHERE class_id=? ORDER BY section_name", (cid,))
+    cur.execute(db.SECTION_NAMES_BY_CLASS, (cid,))
     combo_att_section['values'] = [f"{r[0]}" for r in cur.fetchall()]
 
 def load_students_for_attendance():
@@ -451,7 +392,7 @@ def load_students_for_attendance():
         messagebox.showwarning("Select", "Select class & section")
         return
     secid = combo_att_section.get()
-    cur.execute("SELECT id, name FROM students WHERE section_id=? ORDER BY name", (secid,))
+    cur.execute(db.STUDENTS_BY_SECTION, (secid,))
     for r in cur.fetchall():
         tree_take.insert("", tk.END, values=r)
     # reset status_vars
@@ -466,12 +407,12 @@ def save_attendance():
         sid, name = tree_take.item(item, "values")
         status = status_vars[item].get()
         # If an entry exists, update; else insert
-        cur.execute("SELECT id FROM attendance WHERE student_id=? AND date=?", (sid, d))
+        cur.execute(db.ATTENDANCE_ID_FOR_DAY, (sid, d))
         row = cur.fetchone()
         if row:
-            cur.execute("UPDATE attendance SET status=? WHERE id=?", (status, row[0]))
+            cur.execute(db.ATTENDANCE_SET_STATUS, (status, row[0]))
         else:
-            cur.execute("INSERT INTO attendance(student_id, date, status) VALUES(?,?,?)", (sid, d, status))
+            cur.execute(db.ATTENDANCE_INSERT, (sid, d, status))
     conn.commit()
     load_attendance_table()
     messagebox.showinfo("Saved", "Attendance saved/updated for date: " + d)
@@ -489,12 +430,7 @@ def status_cell_click(event):
 
 def load_attendance_table():
     tree_att.delete(*tree_att.get_children())
-    cur.execute('''SELECT a.id, s.name, c.class_name, se.section_name, a.date, a.status
-                   FROM attendance a
-                   JOIN students s ON a.student_id=s.id
-                   JOIN classes c ON s.class_id=c.id
-                   JOIN sections se ON s.section_id=se.id
-                   ORDER BY a.date DESC, c.class_name, se.section_name, s.name''')
+    cur.execute(db.ATTENDANCE_LIST)
     for r in cur.fetchall():
         tree_att.insert("", tk.END, values=r)
 
@@ -506,7 +442,7 @@ def edit_attendance():
     aid, name, cls, sec, date_, old = tree_att.item(sel, "values")
     new = simple_input("Edit Attendance", f"Status for {name} on {date_} (Present/Absent):", old)
     if new:
-        cur.execute("UPDATE attendance SET status=? WHERE id=?", (new, aid))
+        cur.execute(db.ATTENDANCE_SET_STATUS, (new, aid))
         conn.commit()
         load_attendance_table()
 
@@ -518,7 +454,7 @@ def delete_attendance():
     aid = tree_att.item(sel, "values")[0]
     if not confirm("Delete selected attendance record?"):
         return
-    cur.execute("DELETE FROM attendance WHERE id=?", (aid,))
+    cur.execute(db.ATTENDANCE_DELETE, (aid,))
     conn.commit()
     load_attendance_table()
 
@@ -591,59 +527,64 @@ def generate_class_month_report():
         messagebox.showwarning("Select", "Please select Class, Month and Year.")
         return
 
-    # Get month number
-    month_num = datetime.strptime(month, "%B").strftime("%m")
+    # Get month number and its date range
+    month_num = datetime.strptime(month, "%B").month
+    start, end = db.month_bounds(year, month_num)
+    show_class_report(selected_class, start, end, f"{month} {year}")
+
+
+def generate_class_period_report():
+    selected_class = combo_class_report.get().strip()
+    period = ent_period_report.get().strip()
 
-    # Fetch students belonging to that class
+    if not selected_class or not period:
+        messagebox.showwarning("Select", "Please select Class and enter a Period.")
+        return
     try:
-        cur.execute("""
-            SELECT s.id, s.name 
-            FROM students s
-            JOIN classes c ON s.class_id = c.id
-            WHERE c.class_name = ?
-            ORDER BY s.name
-        """, (selected_class,))
-    except sqlite3.OperationalError:
-        # fallback if 'class_name' column is 'name' in classes table
-        cur.execute("""
-            SELECT s.id, s.name 
-            FROM students s
-            JOIN classes c ON s.class_id = c.id
-            WHERE c.name = ?
-            ORDER BY s.name
-        """, (selected_class,))
-
-    students = cur.fetchall()
-    if not students:
+        start, end = reports.resolve_period(conn, period)
+    except ValueError as e:
+        messagebox.showerror("Period", str(e))
+        return
+    show_class_report(selected_class, start, end, period)
+
+
+def add_term_dialog():
+    name = simple_input("Add Term", "Term name:")
+    if not name:
+        return
+    start = simple_input("Add Term", f"First day of {name} (YYYY-MM-DD):")
+    if not start:
+        return
+    end = simple_input("Add Term", f"Last day of {name} (YYYY-MM-DD):")
+    if not end:
+        return
+    try:
+        reports.add_term(conn, name, start, end)
+    except (ValueError, sqlite3.IntegrityError) as e:
+        messagebox.showerror("Term", str(e))
+        return
+    messagebox.showinfo("Term", f"Added term {name}.")
+
+
+def show_class_report(selected_class, start, end, label):
+    tree_class_report.delete(*tree_class_report.get_children())
+    txt_class_summary.delete("1.0", tk.END)
+
+    cur.execute(db.CLASS_ID_BY_NAME, (selected_class,))
+    row = cur.fetchone()
+    total_class_days, rows = reports.attendance_report(conn, "class", row[0], start, end) if row else (0, [])
+    if not rows:
         messagebox.showinfo("Info", "No students found in selected class.")
         return
 
-    # Get total working days for that class in the given month
-    cur.execute('''
-        SELECT COUNT(DISTINCT date)
-        FROM attendance
-        WHERE strftime('%Y', date)=? AND strftime('%m', date)=?
-    ''', (year, month_num))
-    total_class_days = cur.fetchone()[0] or 0
-
-    for sid, name in students:
-        # Count student's attendance in that month
-        cur.execute('''
-            SELECT 
-                COUNT(*) AS total,
-                SUM(CASE WHEN status='Present' THEN 1 ELSE 0 END) AS present_days
-            FROM attendance
-            WHERE student_id=? AND strftime('%Y', date)=? AND strftime('%m', date)=?
-        ''', (sid, year, month_num))
-        res = cur.fetchone()
-        total = res[0] or 0
-        present = res[1] or 0
-        absent = (total_class_days - present) if total_class_days else 0
-        percent = (present / total_class_days * 100) if total_class_days else 0
+    last_report.update(start=start, end=end, label=label)
+    for sid, name, section, total, present, absent, percent in rows:
         tree_class_report.insert("", tk.END, values=(sid, name, total_class_days, present, absent, f"{percent:.2f}%"))
 
-    txt_class_summary.insert(tk.END, f"Total Working Days in {month} {year}: {total_class_days}\n")
-    txt_class_summary.insert(tk.END, "Click a student row to check their yearly percentage.\n")
+    txt_class_summary.insert(tk.END, f"Total Working Days in {label}: {total_class_days}\n")
+    scope = "yearly" if combo_year_report.get().strip() else "period"
+    txt_class_summary.insert(tk.END, f"Click a student row to check their {scope} percentage.\n")
+    txt_class_summary.insert(tk.END, "Double-click a student row for their day-by-day history.\n")
 
 
 def on_student_select(event):
@@ -652,28 +593,34 @@ def on_student_select(event):
         return
     sid = tree_class_report.item(selected)["values"][0]
     year = combo_year_report.get().strip()
+    if year:
+        start, end = db.year_bounds(year)
+        period_line = f"Year: {year}"
+    else:
+        # Period report without a year selected: summarise that period
+        start, end = last_report["start"], last_report["end"]
+        period_line = f"Period: {last_report['label']}"
 
     # Fetch student ID
-    cur.execute("SELECT name FROM students WHERE id=?", (sid,))
+    cur.execute(db.STUDENT_NAME, (sid,))
     student_name = cur.fetchone()[0]
 
     # Yearly stats for that student
-    cur.execute('''
-        SELECT COUNT(*) AS total,
-               SUM(CASE WHEN status='Present' THEN 1 ELSE 0 END) AS present
-        FROM attendance
-        WHERE student_id=? AND strftime('%Y', date)=?
-    ''', (sid, year))
+    cur.execute(db.STUDENT_TOTALS_IN_RANGE, (sid, start, end))
     total, present = cur.fetchone()
     percent = (present / total * 100) if total else 0
 
     txt_class_summary.delete("1.0", tk.END)
     txt_class_summary.insert(tk.END, f"Student: {student_name}\n")
-    txt_class_summary.insert(tk.END, f"Year: {year}\n")
+    txt_class_summary.insert(tk.END, f"{period_line}\n")
     txt_class_summary.insert(tk.END, f"Total Days Recorded: {total}\n")
     txt_class_summary.insert(tk.END, f"Total Presents: {present}\n")
     txt_class_summary.insert(tk.END, f"Overall Attendance: {percent:.2f}%\n")
 
+    # Keep an open history panel in step with the selection
+    if history_win.winfo_viewable():
+        show_student_history(sid)
+
 
 # ----------- UI for Class-wise Monthly Report -------------
 frame_class_report = ttk.LabelFrame(frm_view, text="Class-wise Monthly Attendance Report")
@@ -701,40 +648,164 @@ combo_month_report.grid(row=0, column=5, padx=6, pady=4, sticky="w")
 
 ttk.Button(frame_class_report, text="Generate Report", command=generate_class_month_report).grid(row=0, column=6, padx=10, pady=4)
 
+# Free-form period: date range, ISO week or term name
+ttk.Label(frame_class_report, text="Or Period:").grid(row=1, column=0, padx=6, pady=4, sticky="w")
+ent_period_report = ttk.Entry(frame_class_report, width=36)
+ent_period_report.grid(row=1, column=1, columnspan=3, padx=6, pady=4, sticky="w")
+ttk.Label(frame_class_report, text="(YYYY-MM-DD:YYYY-MM-DD, 2024-W05 or term name)").grid(row=1, column=4, padx=6, pady=4, sticky="w")
+ttk.Button(frame_class_report, text="Add Term...", command=add_term_dialog).grid(row=1, column=5, padx=6, pady=4, sticky="w")
+ttk.Button(frame_class_report, text="Generate Period Report", command=generate_class_period_report).grid(row=1, column=6, padx=10, pady=4)
+last_report = {}
+
 # Treeview for Class Report
 cols_class_report = ("ID", "Student", "Total Days", "Present", "Absent", "Percentage")
 tree_class_report = ttk.Treeview(frame_class_report, columns=cols_class_report, show="headings", height=12)
 for c in cols_class_report:
     tree_class_report.heading(c, text=c, anchor="center")
     tree_class_report.column(c, width=150, anchor="center")
-tree_class_report.grid(row=1, column=0, columnspan=7, padx=10, pady=6, sticky="nsew")
+tree_class_report.grid(row=2, column=0, columnspan=7, padx=10, pady=6, sticky="nsew")
 
 tree_class_report.bind("<<TreeviewSelect>>", on_student_select)
 
 # Summary box
 txt_class_summary = tk.Text(frame_class_report, height=5)
-txt_class_summary.grid(row=2, column=0, columnspan=7, padx=10, pady=6, sticky="ew")
+txt_class_summary.grid(row=3, column=0, columnspan=7, padx=10, pady=6, sticky="ew")
 
-frame_class_report.grid_rowconfigure(1, weight=1)
+frame_class_report.grid_rowconfigure(2, weight=1)
 frame_class_report.grid_columnconfigure(6, weight=1)
 
 
+# -------------------- STUDENT HISTORY DRILL-DOWN --------------------
+HEAT_COLORS = {"Present": "#8bc34a", "Absent": "#e57373"}
+HEAT_EMPTY = "#eeeeee"
+history_state = {"sid": None, "cursors": [None], "last": None, "year": 0, "month": 0}
+
+def open_student_history(event=None):
+    selected = tree_class_report.focus()
+    if not selected:
+        return
+    show_student_history(tree_class_report.item(selected)["values"][0])
+    history_win.deiconify()
+    history_win.lift()
+
+def show_student_history(sid):
+    cur.execute(db.STUDENT_NAME, (sid,))
+    row = cur.fetchone()
+    if not row:
+        return
+    history_state.update(sid=sid, cursors=[None])
+    lbl_history_name.config(text=f"{row[0]} (ID {sid})")
+    load_history_page()
+
+    # Start the heatmap on the student's most recent month
+    latest = tree_history.get_children()
+    if latest:
+        d = tree_history.item(latest[0], "values")[0]
+        history_state.update(year=int(d[:4]), month=int(d[5:7]))
+    else:
+        today = datetime.now()
+        history_state.update(year=today.year, month=today.month)
+    draw_heatmap()
+
+def load_history_page():
+    tree_history.delete(*tree_history.get_children())
+    rows, has_older = history.page(conn, history_state["sid"], history_state["cursors"][-1])
+    for r in rows:
+        tree_history.insert("", tk.END, values=r)
+    history_state["last"] = rows[-1][0] if rows else None
+    btn_history_older.config(state="normal" if has_older else "disabled")
+    btn_history_newer.config(state="normal" if len(history_state["cursors"]) > 1 else "disabled")
+    lbl_history_page.config(text=f"Page {len(history_state['cursors'])}")
+
+def history_older():
+    history_state["cursors"].append(history_state["last"])
+    load_history_page()
+
+def history_newer():
+    if len(history_state["cursors"]) > 1:
+        history_state["cursors"].pop()
+        load_history_page()
+
+def on_history_select(event=None):
+    # Jump the heatmap to the month of the clicked record
+    sel = tree_history.selection()
+    if not sel:
+        return
+    d = tree_history.item(sel[0], "values")[0]
+    history_state.update(year=int(d[:4]), month=int(d[5:7]))
+    draw_heatmap()
+
+def shift_heatmap(step):
+    y, m = history_state["year"], history_state["month"] + step
+    if m < 1:
+        y, m = y - 1, 12
+    elif m > 12:
+        y, m = y + 1, 1
+    history_state.update(year=y, month=m)
+    draw_heatmap()
+
+def draw_heatmap():
+    y, m = history_state["year"], history_state["month"]
+    days = history.month(conn, history_state["sid"], y, m)
+    lbl_heat_month.config(text=f"{calendar.month_name[m]} {y}")
+    weeks = calendar.monthcalendar(y, m)
+    for w, row in enumerate(heat_cells):
+        for d, cell in enumerate(row):
+            day = weeks[w][d] if w < len(weeks) else 0
+            if day:
+                cell.config(text=str(day), bg=HEAT_COLORS.get(days.get(day), HEAT_EMPTY))
+            else:
+                cell.config(text="", bg=history_win.cget("bg"))
+
+# Built once and hidden; closing the window only withdraws it
+history_win = tk.Toplevel(root)
+history_win.title("Student History")
+history_win.withdraw()
+history_win.protocol("WM_DELETE_WINDOW", history_win.withdraw)
+
+lbl_history_name = ttk.Label(history_win, text="", font=("TkDefaultFont", 11, "bold"))
+lbl_history_name.grid(row=0, column=0, columnspan=2, padx=10, pady=(10,4), sticky="w")
+
+cols_history = ("Date", "Status")
+tree_history = ttk.Treeview(history_win, columns=cols_history, show="headings", height=history.PAGE_SIZE)
+for c in cols_history:
+    tree_history.heading(c, text=c, anchor="center")
+    tree_history.column(c, width=120, anchor="center")
+tree_history.grid(row=1, column=0, padx=10, pady=6, sticky="ns")
+tree_history.bind("<<TreeviewSelect>>", on_history_select)
+
+history_nav = ttk.Frame(history_win); history_nav.grid(row=2, column=0, padx=10, pady=6)
+btn_history_newer = ttk.Button(history_nav, text="< Newer", command=history_newer)
+btn_history_newer.grid(row=0, column=0, padx=4)
+lbl_history_page = ttk.Label(history_nav, text="")
+lbl_history_page.grid(row=0, column=1, padx=8)
+btn_history_older = ttk.Button(history_nav, text="Older >", command=history_older)
+btn_history_older.grid(row=0, column=2, padx=4)
+
+# Month heatmap: green present, red absent, grey no record
+heat_frame = ttk.Frame(history_win); heat_frame.grid(row=1, column=1, padx=10, pady=6, sticky="n")
+heat_head = ttk.Frame(heat_frame); heat_head.grid(row=0, column=0, columnspan=7, pady=(0,6))
+ttk.Button(heat_head, text="<", width=3, command=lambda: shift_heatmap(-1)).grid(row=0, column=0)
+lbl_heat_month = ttk.Label(heat_head, text="", width=16, anchor="center")
+lbl_heat_month.grid(row=0, column=1, padx=6)
+ttk.Button(heat_head, text=">", width=3, command=lambda: shift_heatmap(1)).grid(row=0, column=2)
+for d, name in enumerate(calendar.day_abbr):
+    ttk.Label(heat_frame, text=name[:2]).grid(row=1, column=d, padx=1, pady=1)
+heat_cells = []
+for w in range(6):
+    row = []
+    for d in range(7):
+        cell = tk.Label(heat_frame, text="", width=4, height=2, relief="flat")
+        cell.grid(row=w + 2, column=d, padx=1, pady=1)
+        row.append(cell)
+    heat_cells.append(row)
+
+tree_class_report.bind("<Double-1>", open_student_history)
+
+
 # -------------------- Load Class Names into Dropdown --------------------
 def load_class_report_classes():
-    try:
-        cur.execute("""
-            SELECT DISTINCT c.class_name
-            FROM classes c
-            JOIN students s ON s.class_id = c.id
-            ORDER BY c.class_name
-        """)
-    except sqlite3.OperationalError:
-        cur.execute("""
-            SELECT DISTINCT c.name
-            FROM classes c
-            JOIN students s ON s.class_id = c.id
-            ORDER BY c.name
-        """)
+    cur.execute(db.REPORT_CLASS_NAMES)
     combo_class_report['values'] = [r[0] for r in cur.fetchall()]
 
 # Call once at startup
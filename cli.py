@@ -0,0 +1,235 @@
+"""Headless entry point for scheduled jobs.
+
+Imports only the database modules (no tkinter/tkcalendar), so it runs on
+servers without a display:
+
+    python cli.py init
+    python cli.py report --period 2024-03 > march.csv
+    python cli.py report --class "Class 1" --section A --period "Term 1"
+    python cli.py import attendance.csv
+    python cli.py export --period 2024 -o 2024.csv
+    python cli.py analyze
+    python cli.py vacuum
+    python cli.py check
+    python cli.py backup nightly.db
+    python cli.py stats
+    python cli.py term add "Term 1" 2024-01-08 2024-03-29
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+
+import db
+import migrations
+import reports
+
+STATUSES = ("Present", "Absent")
+
+
+# -------------------- Commands --------------------
+def cmd_init(conn, args):
+    print(f"Database ready at schema version {migrations.current_version(conn)}.")
+
+
+def cmd_report(conn, args):
+    start, end = reports.resolve_period(conn, args.period)
+    if args.student:
+        _lookup(conn, db.STUDENT_NAME, (args.student,), f"Unknown student: {args.student}")
+        targets = [("student", args.student)]
+    elif args.class_name:
+        cid = _lookup(conn, db.CLASS_ID_BY_NAME, (args.class_name,), f"Unknown class: {args.class_name}")
+        if args.section:
+            secid = _lookup(conn, db.SECTION_ID_BY_NAME, (cid, args.section), f"Unknown section: {args.section}")
+            targets = [("section", secid)]
+        else:
+            targets = [("class", cid)]
+    else:
+        # Whole school, one class at a time
+        targets = [("class", cid) for cid, _name in conn.execute(db.CLASSES_LIST).fetchall()]
+
+    with _output(args.output) as f:
+        w = csv.writer(f)
+        w.writerow(["student_id", "name", "section", "recorded", "present", "absent", "working_days", "percent"])
+        for scope, scope_id in targets:
+            working_days, rows = reports.attendance_report(conn, scope, scope_id, start, end)
+            for sid, name, section, total, present, absent, percent in rows:
+                w.writerow([sid, name, section, total, present, absent, working_days, f"{percent:.2f}"])
+
+
+def cmd_import(conn, args):
+    with open(args.file, newline="") as f:
+        students = {r[0] for r in conn.execute(db.STUDENT_IDS)}
+        rows = list(_import_rows(csv.DictReader(f), students))
+    with conn:
+        conn.executemany(db.ATTENDANCE_UPSERT, rows)
+    print(f"Imported {len(rows)} attendance records.")
+
+
+def cmd_export(conn, args):
+    start, end = reports.resolve_period(conn, args.period)
+    with _output(args.output) as f:
+        w = csv.writer(f)
+        w.writerow(["student_id", "name", "class", "section", "date", "status"])
+        w.writerows(conn.execute(db.ATTENDANCE_EXPORT_IN_RANGE, (start, end)))
+
+
+def cmd_analyze(conn, args):
+    conn.execute("ANALYZE")
+    conn.commit()
+    print("Analyzed.")
+
+
+def cmd_vacuum(conn, args):
+    conn.execute("VACUUM")
+    print("Vacuumed.")
+
+
+def cmd_check(conn, args):
+    # integrity_check reports a single "ok" row when it finds nothing
+    problems = [r[0] for r in conn.execute("PRAGMA integrity_check") if r[0] != "ok"]
+    problems += [f"foreign key: {r}" for r in conn.execute("PRAGMA foreign_key_check")]
+    if problems:
+        for p in problems:
+            print(p)
+        return 1
+    print("ok")
+
+
+def cmd_backup(conn, args):
+    dest = sqlite3.connect(args.dest)
+    with dest:
+        conn.backup(dest)
+    dest.close()
+    print(f"Backed up to {args.dest}.")
+
+
+def cmd_stats(conn, args):
+    classes, sections, students, records, first, last = conn.execute(db.STATS).fetchone()
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    print(f"Schema version:     {migrations.current_version(conn)}")
+    print(f"Classes:            {classes}")
+    print(f"Sections:           {sections}")
+    print(f"Students:           {students}")
+    print(f"Attendance records: {records}")
+    print(f"Date range:         {first or '-'} .. {last or '-'}")
+    print(f"Database size:      {page_count * page_size / 1024:.1f} KiB")
+
+
+def cmd_term(conn, args):
+    if args.action == "add":
+        reports.add_term(conn, args.name, args.start, args.end)
+        print(f"Added term {args.name}.")
+    else:
+        for name, start, end in conn.execute(db.TERMS_LIST):
+            print(f"{name}\t{start}\t{end}")
+
+
+# -------------------- Helpers --------------------
+def _lookup(conn, sql, params, error):
+    row = conn.execute(sql, params).fetchone()
+    if not row:
+        raise ValueError(error)
+    return row[0]
+
+
+def _import_rows(reader, students):
+    for line, row in enumerate(reader, start=2):
+        try:
+            sid = int(row["student_id"])
+            day = reports.parse_day(row["date"]).isoformat()
+            status = row["status"].strip()
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise ValueError(f"Line {line}: expected student_id, date (YYYY-MM-DD) and status columns.")
+        if status not in STATUSES:
+            raise ValueError(f"Line {line}: status must be Present or Absent, not {status!r}.")
+        if sid not in students:
+            raise ValueError(f"Line {line}: unknown student_id {sid}.")
+        yield sid, day, status
+
+
+@contextmanager
+def _output(path):
+    # A file when a path is given, otherwise stdout
+    if not path:
+        yield sys.stdout
+        return
+    with open(path, "w", newline="") as f:
+        yield f
+
+
+# -------------------- Entry point --------------------
+def build_parser():
+    parser = argparse.ArgumentParser(description="Attendance management (headless).")
+    parser.add_argument("--db", default=db.DB, help=f"database file (default: {db.DB})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("init", help="create the database (or bring it up to date)").set_defaults(func=cmd_init)
+
+    p = sub.add_parser("report", help="per-student attendance report as CSV")
+    p.add_argument("--period", required=True, help="YYYY, YYYY-MM, YYYY-Www, YYYY-MM-DD:YYYY-MM-DD or a term name")
+    p.add_argument("--class", dest="class_name", help="class name (default: every class)")
+    p.add_argument("--section", help="section name within --class")
+    p.add_argument("--student", type=int, help="student id")
+    p.add_argument("-o", "--output", help="write CSV here instead of stdout")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("import", help="upsert attendance from a CSV with student_id,date,status")
+    p.add_argument("file")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="attendance records in a period as CSV")
+    p.add_argument("--period", required=True)
+    p.add_argument("-o", "--output")
+    p.set_defaults(func=cmd_export)
+
+    sub.add_parser("analyze", help="refresh query planner statistics").set_defaults(func=cmd_analyze)
+    sub.add_parser("vacuum", help="rebuild the database file").set_defaults(func=cmd_vacuum)
+    sub.add_parser("check", help="integrity and foreign key checks").set_defaults(func=cmd_check)
+
+    p = sub.add_parser("backup", help="online backup to another file")
+    p.add_argument("dest")
+    p.set_defaults(func=cmd_backup)
+
+    sub.add_parser("stats", help="row counts and database size").set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("term", help="manage named terms")
+    p.add_argument("action", choices=["add", "list"])
+    p.add_argument("name", nargs="?")
+    p.add_argument("start", nargs="?", help="first day, YYYY-MM-DD")
+    p.add_argument("end", nargs="?", help="last day, YYYY-MM-DD")
+    p.set_defaults(func=cmd_term)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "report" and args.section and not args.class_name:
+        parser.error("--section needs --class")
+    if args.command == "term" and args.action == "add" and not (args.name and args.start and args.end):
+        parser.error("term add needs NAME START END")
+
+    # sqlite3.connect() would quietly create an empty database for a
+    # mistyped path; only init is allowed to do that.
+    if args.command != "init" and not os.path.exists(args.db):
+        print(f"error: no database at {args.db} (run `cli.py init` to create one)", file=sys.stderr)
+        return 1
+
+    conn = None
+    try:
+        conn = db.connect(args.db)
+        return args.func(conn, args) or 0
+    except (ValueError, OSError, RuntimeError, sqlite3.Error) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+import sqlite3
+
+import migrations
+
+# -------------------- Database Setup --------------------
+DB = "attendance.db"
+
+
+def connect(path=DB):
+    conn = sqlite3.connect(path)
+    migrations.migrate(conn)
+    return conn
+
+
+# -------------------- Date Ranges --------------------
+# Dates are stored as 'YYYY-MM-DD' text, so half-open string ranges
+# compare correctly and can use the date indexes (strftime() cannot).
+def month_bounds(year, month):
+    year, month = int(year), int(month)
+    if not 1 <= month <= 12:
+        raise ValueError(f"Month must be between 1 and 12, not {month}.")
+    start = f"{year:04d}-{month:02d}-01"
+    if month == 12:
+        end = f"{year + 1:04d}-01-01"
+    else:
+        end = f"{year:04d}-{month + 1:02d}-01"
+    return start, end
+
+
+def year_bounds(year):
+    year = int(year)
+    return f"{year:04d}-01-01", f"{year + 1:04d}-01-01"
+
+
+# -------------------- Statements --------------------
+# Every statement the app issues lives here so plan_check.py can run
+# EXPLAIN QUERY PLAN over all of them.
+
+# Classes
+CLASS_INSERT = "INSERT INTO classes(class_name) VALUES(?)"
+CLASS_RENAME = "UPDATE classes SET class_name=? WHERE id=?"
+CLASS_DELETE = "DELETE FROM classes WHERE id=?"
+CLASSES_LIST = "SELECT id, class_name FROM classes ORDER BY class_name"
+CLASS_NAMES = "SELECT class_name FROM classes ORDER BY class_name"
+CLASS_ID_BY_NAME = "SELECT id FROM classes WHERE class_name=?"
+REPORT_CLASS_NAMES = """
+    SELECT DISTINCT c.class_name
+    FROM classes c
+    JOIN students s ON s.class_id = c.id
+    ORDER BY c.class_name
+"""
+
+# Sections
+SECTION_INSERT = "INSERT INTO sections(class_id, section_name) VALUES(?,?)"
+SECTION_RENAME = "UPDATE sections SET section_name=? WHERE id=?"
+SECTION_DELETE = "DELETE FROM sections WHERE id=?"
+SECTIONS_DELETE_BY_CLASS = "DELETE FROM sections WHERE class_id=?"
+SECTIONS_LIST = """
+    SELECT c.class_name, s.section_name
+    FROM sections s
+    JOIN classes c ON s.class_id=c.id
+    ORDER BY c.class_name, s.section_name
+"""
+SECTION_NAMES_BY_CLASS = "SELECT section_name FROM sections WHERE class_id=? ORDER BY section_name"
+
+# Students
+STUDENT_INSERT = "INSERT INTO students(name, class_id, section_id) VALUES(?,?,?)"
+STUDENT_RENAME = "UPDATE students SET name=? WHERE id=?"
+STUDENT_DELETE = "DELETE FROM students WHERE id=?"
+STUDENTS_DELETE_BY_CLASS = "DELETE FROM students WHERE class_id=?"
+STUDENTS_DELETE_BY_SECTION = "DELETE FROM students WHERE section_id=?"
+STUDENT_IDS_BY_CLASS = "SELECT id FROM students WHERE class_id=?"
+STUDENT_IDS_BY_SECTION = "SELECT id FROM students WHERE section_id=?"
+STUDENT_NAME = "SELECT name FROM students WHERE id=?"
+STUDENT_IDS = "SELECT id FROM students"
+STUDENTS_LIST = """
+    SELECT s.id, s.name, c.class_name, sec.section_name
+    FROM students s
+    JOIN classes c ON s.class_id=c.id
+    JOIN sections sec ON s.section_id=sec.id
+    ORDER BY c.class_name, sec.section_name, s.name
+"""
+STUDENTS_BY_CLASS = """
+    SELECT s.id, s.name, c.class_name, sec.section_name
+    FROM students s
+    JOIN classes c ON s.class_id=c.id
+    JOIN sections sec ON s.section_id=sec.id
+    WHERE s.class_id=?
+    ORDER BY sec.section_name, s.name
+"""
+STUDENTS_BY_CLASS_SECTION = """
+    SELECT s.id, s.name, c.class_name, sec.section_name
+    FROM students s
+    JOIN classes c ON s.class_id=c.id
+    JOIN sections sec ON s.section_id=sec.id
+    WHERE s.class_id=? AND s.section_id=(SELECT id FROM sections WHERE section_name=? AND class_id=?)
+    ORDER BY s.name
+"""
+STUDENTS_BY_SECTION = "SELECT id, name FROM students WHERE section_id=? ORDER BY name"
+SECTION_ID_BY_NAME = "SELECT id FROM sections WHERE class_id=? AND section_name=?"
+
+# Attendance
+ATTENDANCE_INSERT = "INSERT INTO attendance(student_id, date, status) VALUES(?,?,?)"
+ATTENDANCE_SET_STATUS = "UPDATE attendance SET status=? WHERE id=?"
+ATTENDANCE_DELETE = "DELETE FROM attendance WHERE id=?"
+ATTENDANCE_DELETE_BY_STUDENT = "DELETE FROM attendance WHERE student_id=?"
+ATTENDANCE_ID_FOR_DAY = "SELECT id FROM attendance WHERE student_id=? AND date=?"
+ATTENDANCE_UPSERT = """
+    INSERT INTO attendance(student_id, date, status) VALUES(?,?,?)
+    ON CONFLICT(student_id, date) DO UPDATE SET status=excluded.status
+"""
+ATTENDANCE_EXPORT_IN_RANGE = """
+    SELECT a.student_id, s.name, c.class_name, se.section_name, a.date, a.status
+    FROM attendance a
+    JOIN students s ON a.student_id=s.id
+    JOIN classes c ON s.class_id=c.id
+    JOIN sections se ON s.section_id=se.id
+    WHERE a.date >= ? AND a.date < ?
+    ORDER BY a.date, a.student_id
+"""
+ATTENDANCE_LIST = """
+    SELECT a.id, s.name, c.class_name, se.section_name, a.date, a.status
+    FROM attendance a
+    JOIN students s ON a.student_id=s.id
+    JOIN classes c ON s.class_id=c.id
+    JOIN sections se ON s.section_id=se.id
+    ORDER BY a.date DESC, c.class_name, se.section_name, s.name
+"""
+
+# Reports (date ranges are half-open: start <= date < end). The GROUP BY
+# columns follow the students indexes so the roster is a SEARCH, not a SCAN.
+# sections is LEFT JOINed: older rows written by add_student hold the
+# section name rather than its id in students.section_id, so the section
+# scope matches either form within the section's class.
+WORKING_DAYS_IN_RANGE = """
+    SELECT COUNT(DISTINCT date)
+    FROM attendance
+    WHERE date >= ? AND date < ?
+"""
+STUDENT_TOTALS_IN_RANGE = """
+    SELECT COUNT(*) AS total,
+           SUM(CASE WHEN status='Present' THEN 1 ELSE 0 END) AS present
+    FROM attendance
+    WHERE student_id=? AND date >= ? AND date < ?
+"""
+REPORT_BY_CLASS = """
+    SELECT s.id, s.name, COALESCE(sec.section_name, s.section_id) AS section,
+           COUNT(a.id) AS total,
+           COALESCE(SUM(a.status='Present'), 0) AS present
+    FROM students s
+    LEFT JOIN sections sec ON s.section_id=sec.id
+    LEFT JOIN attendance a ON a.student_id=s.id AND a.date >= ? AND a.date < ?
+    WHERE s.class_id=?
+    GROUP BY s.section_id, s.name, s.id
+    ORDER BY section, s.name
+"""
+REPORT_BY_SECTION = """
+    SELECT s.id, s.name, COALESCE(sec.section_name, s.section_id) AS section,
+           COUNT(a.id) AS total,
+           COALESCE(SUM(a.status='Present'), 0) AS present
+    FROM sections target
+    JOIN students s ON s.class_id=target.class_id
+                   AND s.section_id IN (target.id, target.section_name)
+    LEFT JOIN sections sec ON s.section_id=sec.id
+    LEFT JOIN attendance a ON a.student_id=s.id AND a.date >= ? AND a.date < ?
+    WHERE target.id=?
+    GROUP BY s.section_id, s.name, s.id
+    ORDER BY s.name
+"""
+REPORT_BY_STUDENT = """
+    SELECT s.id, s.name, COALESCE(sec.section_name, s.section_id) AS section,
+           COUNT(a.id) AS total,
+           COALESCE(SUM(a.status='Present'), 0) AS present
+    FROM students s
+    LEFT JOIN sections sec ON s.section_id=sec.id
+    LEFT JOIN attendance a ON a.student_id=s.id AND a.date >= ? AND a.date < ?
+    WHERE s.id=?
+    GROUP BY s.id
+"""
+
+# Per-student history. Pages are keyset-paginated on (student_id, date):
+# the next page starts below the last date shown, newest first.
+HISTORY_FIRST_PAGE = """
+    SELECT date, status FROM attendance
+    WHERE student_id=?
+    ORDER BY date DESC
+    LIMIT ?
+"""
+HISTORY_PAGE_BEFORE = """
+    SELECT date, status FROM attendance
+    WHERE student_id=? AND date < ?
+    ORDER BY date DESC
+    LIMIT ?
+"""
+HISTORY_IN_RANGE = """
+    SELECT date, status FROM attendance
+    WHERE student_id=? AND date >= ? AND date < ?
+    ORDER BY date
+"""
+
+# Terms (end_date is inclusive)
+TERM_INSERT = "INSERT INTO terms(name, start_date, end_date) VALUES(?,?,?)"
+TERM_BY_NAME = "SELECT start_date, end_date FROM terms WHERE name=?"
+TERMS_LIST = "SELECT name, start_date, end_date FROM terms ORDER BY start_date"
+
+# Stats
+STATS = """
+    SELECT (SELECT COUNT(*) FROM classes),
+           (SELECT COUNT(*) FROM sections),
+           (SELECT COUNT(*) FROM students),
+           (SELECT COUNT(*) FROM attendance),
+           (SELECT MIN(date) FROM attendance),
+           (SELECT MAX(date) FROM attendance)
+"""
@@ -0,0 +1,63 @@
+"""Per-student attendance history for the drill-down panel.
+
+Pages use keyset pagination on the (student_id, date) index: each page
+reads only its own rows, however far back the student's history goes.
+Pages and months are held in small LRU caches so clicking back and forth
+between recently viewed students does not touch the database.
+
+Cache entries are keyed on the database's state: PRAGMA data_version
+(bumped by commits from other connections, such as a nightly
+`cli.py import`) together with conn.total_changes (this connection's own
+writes). Any write therefore makes older entries unreachable; they age
+out of the LRU.
+"""
+from functools import lru_cache
+from types import MappingProxyType
+
+import db
+
+PAGE_SIZE = 20
+CACHE_SIZE = 64
+
+
+def page(conn, student_id, before=None, limit=PAGE_SIZE):
+    """Up to `limit` (date, status) rows older than `before`, newest first.
+
+    Returns (rows, has_older). Pass the last date of a page as `before`
+    to get the next (older) page.
+    """
+    return _page(conn, _state(conn), student_id, before, limit)
+
+
+def month(conn, student_id, year, month_no):
+    """Read-only {day of month: status} mapping for one calendar month.
+
+    The mapping is shared with every other caller through the cache, so
+    it cannot be modified.
+    """
+    return _month(conn, _state(conn), student_id, year, month_no)
+
+
+def clear_cache():
+    _page.cache_clear()
+    _month.cache_clear()
+
+
+def _state(conn):
+    return conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _page(conn, state, student_id, before, limit):
+    if before is None:
+        rows = conn.execute(db.HISTORY_FIRST_PAGE, (student_id, limit + 1)).fetchall()
+    else:
+        rows = conn.execute(db.HISTORY_PAGE_BEFORE, (student_id, before, limit + 1)).fetchall()
+    return tuple(rows[:limit]), len(rows) > limit
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _month(conn, state, student_id, year, month_no):
+    start, end = db.month_bounds(year, month_no)
+    rows = conn.execute(db.HISTORY_IN_RANGE, (student_id, start, end)).fetchall()
+    return MappingProxyType({int(d[8:10]): status for d, status in rows})
@@ -0,0 +1,192 @@
+"""Versioned schema migrations keyed on PRAGMA user_version.
+
+Each migration is (version, description, apply, batch):
+
+- apply(conn) runs inside a single transaction together with the
+  user_version bump.
+- batch(conn, after_id, limit) is for heavy data rewrites. It processes
+  up to `limit` rows with id > after_id and returns the last id it
+  handled, or None when there is nothing left. Every batch commits on
+  its own and records its position in migration_progress, so an
+  interrupted upgrade resumes where it stopped instead of starting over
+  or holding one long write lock.
+
+When a migration has both, the batches run first and apply(conn, after_id)
+runs last, with the id the batches stopped at. It must also cover rows
+written after that point, since the app may have kept writing between
+batches.
+"""
+from contextlib import contextmanager
+
+BATCH_SIZE = 5000
+
+
+# -------------------- Migrations --------------------
+def create_tables(conn):
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS classes(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        class_name TEXT NOT NULL UNIQUE
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS sections(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        class_id INTEGER NOT NULL,
+        section_name TEXT NOT NULL,
+        FOREIGN KEY(class_id) REFERENCES classes(id)
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS students(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        class_id INTEGER NOT NULL,
+        section_id INTEGER NOT NULL,
+        FOREIGN KEY(class_id) REFERENCES classes(id),
+        FOREIGN KEY(section_id) REFERENCES sections(id)
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS attendance(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        status TEXT NOT NULL,
+        FOREIGN KEY(student_id) REFERENCES students(id)
+    )
+    ''')
+
+
+def add_lookup_indexes(conn):
+    # Indexes backing the statements in db.py (see plan_check.py)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sections_class ON sections(class_id, section_name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_students_class ON students(class_id, section_id, name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_students_section ON students(section_id, name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_attendance_student_date ON attendance(student_id, date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance(date)")
+
+
+# Deletes every older copy of the rows in an id range, wherever those
+# copies sit in the table, so the newest of each (student_id, date) wins
+# even when a duplicate arrives after its older twin was already batched.
+DELETE_OLDER_COPIES = '''
+    DELETE FROM attendance WHERE id IN (
+        SELECT older.id
+        FROM attendance recent
+        JOIN attendance older ON older.student_id = recent.student_id
+                             AND older.date = recent.date
+                             AND older.id < recent.id
+        WHERE recent.id > ? AND recent.id <= ?
+    )
+'''
+
+
+def dedupe_attendance(conn, after_id, limit):
+    rows = conn.execute(
+        "SELECT id FROM attendance WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+    ).fetchall()
+    if not rows:
+        return None
+    last = rows[-1][0]
+    conn.execute(DELETE_OLDER_COPIES, (after_id, last))
+    return last
+
+
+def unique_attendance_per_day(conn, after_id):
+    # Catch up on rows written since the last batch
+    conn.execute(DELETE_OLDER_COPIES, (after_id, 2**63 - 1))
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_attendance_student_date ON attendance(student_id, date)")
+    conn.execute("DROP INDEX IF EXISTS idx_attendance_student_date")
+
+
+def create_terms(conn):
+    # Named reporting periods; end_date is inclusive
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS terms(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        start_date TEXT NOT NULL,
+        end_date TEXT NOT NULL
+    )
+    ''')
+
+
+MIGRATIONS = [
+    (1, "create tables", create_tables, None),
+    (2, "add lookup indexes", add_lookup_indexes, None),
+    (3, "one attendance record per student and day", unique_attendance_per_day, dedupe_attendance),
+    (4, "named terms", create_terms, None),
+]
+
+LATEST = MIGRATIONS[-1][0]
+
+
+# -------------------- Runner --------------------
+def current_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, batch_size=BATCH_SIZE):
+    """Bring the database up to LATEST. Returns the versions applied."""
+    version = current_version(conn)
+    if version > LATEST:
+        raise RuntimeError(f"Database schema version {version} is newer than this app ({LATEST}).")
+
+    applied = []
+    isolation = conn.isolation_level
+    conn.commit()
+    conn.isolation_level = None  # explicit BEGIN/COMMIT below
+    try:
+        for number, _description, apply, batch in MIGRATIONS:
+            if number <= version:
+                continue
+            if batch:
+                _run_batches(conn, number, batch, batch_size)
+            with _transaction(conn):
+                if batch:
+                    after_id = _progress(conn, number)
+                    conn.execute("DELETE FROM migration_progress WHERE version=?", (number,))
+                    if apply:
+                        apply(conn, after_id)
+                elif apply:
+                    apply(conn)
+                conn.execute(f"PRAGMA user_version = {number}")
+            applied.append(number)
+    finally:
+        conn.isolation_level = isolation
+    return applied
+
+
+def _run_batches(conn, number, batch, batch_size):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS migration_progress(
+            version INTEGER PRIMARY KEY,
+            last_id INTEGER NOT NULL
+        )
+    ''')
+    while True:
+        with _transaction(conn):
+            last = batch(conn, _progress(conn, number), batch_size)
+            if last is None:
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO migration_progress(version, last_id) VALUES(?, ?)",
+                (number, last),
+            )
+
+
+def _progress(conn, number):
+    row = conn.execute("SELECT last_id FROM migration_progress WHERE version=?", (number,)).fetchone()
+    return row[0] if row else 0
+
+
+@contextmanager
+def _transaction(conn):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
@@ -0,0 +1,125 @@
+"""Query-plan regression check.
+
+Runs EXPLAIN QUERY PLAN for every statement in db.py against a seeded
+in-memory database and fails when a statement scans a table that should
+be reached through an index, skip-scans an index (ANY(...), a full index
+walk in disguise), leaves out a range constraint it depends on, or sorts
+rows that should come back in index order.
+
+    python plan_check.py
+"""
+import re
+import sqlite3
+import sys
+
+import db
+import migrations
+
+# Tables (or aliases) a statement is allowed to scan in full. Listings
+# that read every row anyway are the only expected scans; everything
+# else must be a SEARCH.
+ALLOWED_SCANS = {
+    "CLASSES_LIST": {"classes"},
+    "CLASS_NAMES": {"classes"},
+    "REPORT_CLASS_NAMES": {"c"},
+    "SECTIONS_LIST": {"s", "c"},
+    "STUDENTS_LIST": {"s", "c", "sec"},
+    "ATTENDANCE_LIST": {"a", "s", "c", "se"},
+    "TERMS_LIST": {"terms"},
+    "STUDENT_IDS": {"students"},
+    "STATS": {"classes", "sections", "students", "attendance"},
+}
+
+# Statements that must come back in index order. Keyset pagination relies
+# on it; a temp B-tree here means every page sorts the student's history.
+INDEX_ORDERED = {"HISTORY_FIRST_PAGE", "HISTORY_PAGE_BEFORE", "HISTORY_IN_RANGE"}
+
+# Constraints that must show up in the plan. Range statements are only
+# cheap when the date range is part of the index search; a plan that
+# searches on student_id alone and filters dates row by row (as the old
+# strftime() queries did) still looks like a SEARCH.
+REQUIRED = {
+    "WORKING_DAYS_IN_RANGE": "(date>? AND date<?)",
+    "ATTENDANCE_EXPORT_IN_RANGE": "(date>? AND date<?)",
+    "STUDENT_TOTALS_IN_RANGE": "(student_id=? AND date>? AND date<?)",
+    "REPORT_BY_CLASS": "(student_id=? AND date>? AND date<?)",
+    "REPORT_BY_SECTION": "(student_id=? AND date>? AND date<?)",
+    "REPORT_BY_STUDENT": "(student_id=? AND date>? AND date<?)",
+    "HISTORY_FIRST_PAGE": "(student_id=?)",
+    "HISTORY_PAGE_BEFORE": "(student_id=? AND date<?)",
+    "HISTORY_IN_RANGE": "(student_id=? AND date>? AND date<?)",
+}
+
+# "SCAN c" on SQLite 3.36+, "SCAN TABLE classes AS c" on older versions
+SCAN_RE = re.compile(r"^SCAN (?:TABLE )?(?!CONSTANT ROW)(\w+)(?: AS (\w+))?")
+
+
+def statements():
+    for name in sorted(vars(db)):
+        value = getattr(db, name)
+        if name.isupper() and isinstance(value, str) and name not in ("DB",):
+            yield name, value
+
+
+def seed(conn, classes=4, sections=3, students=25, days=60):
+    cur = conn.cursor()
+    for c in range(classes):
+        cur.execute(db.CLASS_INSERT, (f"Class {c + 1}",))
+        cid = cur.lastrowid
+        for s in range(sections):
+            cur.execute(db.SECTION_INSERT, (cid, chr(ord("A") + s)))
+            secid = cur.lastrowid
+            for n in range(students):
+                cur.execute(db.STUDENT_INSERT, (f"Student {cid}-{secid}-{n}", cid, secid))
+    cur.execute("SELECT id FROM students")
+    sids = [r[0] for r in cur.fetchall()]
+    rows = []
+    for d in range(days):
+        date = f"2024-{1 + d // 28:02d}-{1 + d % 28:02d}"
+        for sid in sids:
+            rows.append((sid, date, "Absent" if (sid + d) % 7 == 0 else "Present"))
+    cur.executemany(db.ATTENDANCE_INSERT, rows)
+    conn.commit()
+    cur.execute("ANALYZE")
+
+
+def plan(conn, sql):
+    params = (None,) * sql.count("?")
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def check(conn):
+    failures = []
+    for name, sql in statements():
+        allowed = ALLOWED_SCANS.get(name, set())
+        details = plan(conn, sql)
+        for detail in details:
+            m = SCAN_RE.match(detail)
+            if m and (m.group(2) or m.group(1)) not in allowed:
+                failures.append((name, detail))
+            elif "ANY(" in detail:
+                failures.append((name, detail))
+            elif name in INDEX_ORDERED and detail.startswith("USE TEMP B-TREE"):
+                failures.append((name, detail))
+        required = REQUIRED.get(name)
+        if required and not any(required in d for d in details):
+            failures.append((name, f"no index search on {required}"))
+    return failures
+
+
+def main():
+    conn = sqlite3.connect(":memory:")
+    migrations.migrate(conn)
+    seed(conn)
+    failures = check(conn)
+    for name, detail in failures:
+        print(f"{name}: {detail}")
+    if failures:
+        print(f"{len(failures)} plan problem(s) found.")
+        return 1
+    print(f"OK: {len(list(statements()))} statements checked.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Attendance reports over arbitrary date ranges.
+
+Periods resolve to half-open (start, end) date strings so every report is
+a range predicate on the indexed attendance date, whatever its length.
+"""
+import re
+from datetime import date, datetime, timedelta
+
+import db
+
+SCOPES = {
+    "class": db.REPORT_BY_CLASS,
+    "section": db.REPORT_BY_SECTION,
+    "student": db.REPORT_BY_STUDENT,
+}
+
+_YEAR = re.compile(r"^(\d{4})$")
+_MONTH = re.compile(r"^(\d{4})-(\d{2})$")
+_WEEK = re.compile(r"^(\d{4})-W(\d{1,2})$")
+_RANGE = re.compile(r"^(\d{4}-\d{2}-\d{2})(?::|\.\.)(\d{4}-\d{2}-\d{2})$")
+
+
+# -------------------- Periods --------------------
+def parse_day(day):
+    return datetime.strptime(day.strip(), "%Y-%m-%d").date()
+
+
+def date_range(start, end):
+    """Inclusive start/end dates -> half-open bounds."""
+    start, end = parse_day(start), parse_day(end)
+    if end < start:
+        raise ValueError(f"End date {end} is before start date {start}.")
+    return start.isoformat(), (end + timedelta(days=1)).isoformat()
+
+
+def week_bounds(year, week):
+    monday = date.fromisocalendar(int(year), int(week), 1)
+    return monday.isoformat(), (monday + timedelta(days=7)).isoformat()
+
+
+def term_bounds(conn, name):
+    row = conn.execute(db.TERM_BY_NAME, (name,)).fetchone()
+    if not row:
+        raise ValueError(f"Unknown term: {name}")
+    return date_range(*row)
+
+
+def resolve_period(conn, spec):
+    """Turn a period spec into half-open (start, end) bounds.
+
+    Accepts 'YYYY', 'YYYY-MM', ISO weeks like '2024-W05', inclusive
+    ranges 'YYYY-MM-DD:YYYY-MM-DD', or the name of a term.
+    """
+    spec = spec.strip()
+    m = _RANGE.match(spec)
+    if m:
+        return date_range(m.group(1), m.group(2))
+    m = _WEEK.match(spec)
+    if m:
+        return week_bounds(m.group(1), m.group(2))
+    m = _MONTH.match(spec)
+    if m:
+        return db.month_bounds(m.group(1), m.group(2))
+    m = _YEAR.match(spec)
+    if m:
+        return db.year_bounds(m.group(1))
+    return term_bounds(conn, spec)
+
+
+def add_term(conn, name, start, end):
+    """Store a named term; start/end are inclusive YYYY-MM-DD dates.
+
+    Both dates are parsed and normalised before they are compared or
+    stored, so '2024-1-8' is kept as '2024-01-08'. Used by the
+    "Add Term..." button and `cli.py term add`.
+    """
+    date_range(start, end)
+    conn.execute(db.TERM_INSERT, (name, parse_day(start).isoformat(), parse_day(end).isoformat()))
+    conn.commit()
+
+
+# -------------------- Reports --------------------
+def attendance_report(conn, scope, scope_id, start, end):
+    """Per-student totals for a class, section or student over [start, end).
+
+    Returns (working_days, rows) where each row is
+    (student_id, name, section, recorded, present, absent, percent).
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown scope: {scope}")
+    working_days = conn.execute(db.WORKING_DAYS_IN_RANGE, (start, end)).fetchone()[0] or 0
+    rows = []
+    for sid, name, section, total, present in conn.execute(SCOPES[scope], (start, end, scope_id)):
+        absent = (working_days - present) if working_days else 0
+        percent = (present / working_days * 100) if working_days else 0
+        rows.append((sid, name, section, total, present, absent, percent))
+    return working_days, rows
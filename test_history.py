@@ -0,0 +1,77 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import db
+import history
+import migrations
+
+
+def with_days(conn, student_id, days):
+    conn.executemany(db.ATTENDANCE_INSERT, [(student_id, d, "Present") for d in days])
+    conn.commit()
+
+
+class HistoryTest(unittest.TestCase):
+    def setUp(self):
+        history.clear_cache()
+        self.conn = sqlite3.connect(":memory:")
+        migrations.migrate(self.conn)
+        # 25 days for student 1, one day for student 2
+        with_days(self.conn, 1, [f"2024-03-{d:02d}" for d in range(1, 26)])
+        with_days(self.conn, 2, ["2024-03-05"])
+
+    def test_pages_across_boundary(self):
+        rows, has_older = history.page(self.conn, 1, limit=10)
+        self.assertEqual([d for d, _ in rows], [f"2024-03-{d:02d}" for d in range(25, 15, -1)])
+        self.assertTrue(has_older)
+
+        rows, has_older = history.page(self.conn, 1, before=rows[-1][0], limit=10)
+        self.assertEqual(rows[0][0], "2024-03-15")
+        self.assertTrue(has_older)
+
+        rows, has_older = history.page(self.conn, 1, before=rows[-1][0], limit=10)
+        self.assertEqual([d for d, _ in rows], [f"2024-03-{d:02d}" for d in range(5, 0, -1)])
+        self.assertFalse(has_older)
+
+    def test_exact_page_has_no_older(self):
+        rows, has_older = history.page(self.conn, 1, before="2024-03-11", limit=10)
+        self.assertEqual(len(rows), 10)
+        self.assertFalse(has_older)
+
+    def test_month(self):
+        days = history.month(self.conn, 2, 2024, 3)
+        self.assertEqual(dict(days), {5: "Present"})
+        self.assertEqual(dict(history.month(self.conn, 2, 2024, 4)), {})
+        with self.assertRaises(TypeError):
+            days[6] = "Absent"
+
+    def test_own_write_invalidates(self):
+        self.assertEqual(dict(history.month(self.conn, 2, 2024, 3)), {5: "Present"})
+        self.conn.execute(db.ATTENDANCE_UPSERT, (2, "2024-03-05", "Absent"))
+        self.conn.commit()
+        self.assertEqual(dict(history.month(self.conn, 2, 2024, 3)), {5: "Absent"})
+
+
+class OtherConnectionTest(unittest.TestCase):
+    def setUp(self):
+        history.clear_cache()
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.reader = db.connect(self.path)
+        self.writer = db.connect(self.path)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+        os.remove(self.path)
+
+    def test_commit_from_other_connection_invalidates(self):
+        self.assertEqual(history.page(self.reader, 1), ((), False))
+        with_days(self.writer, 1, ["2024-03-01"])
+        self.assertEqual(history.page(self.reader, 1), ((("2024-03-01", "Present"),), False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import sqlite3
+import unittest
+from unittest import mock
+
+import migrations
+
+
+class Interrupted(Exception):
+    pass
+
+
+def version_2_db():
+    # A database as it was before the dedupe migration
+    conn = sqlite3.connect(":memory:")
+    migrations.create_tables(conn)
+    migrations.add_lookup_indexes(conn)
+    conn.execute("PRAGMA user_version = 2")
+    conn.commit()
+    return conn
+
+
+def add_rows(conn, rows):
+    conn.executemany("INSERT INTO attendance(student_id, date, status) VALUES(?,?,?)", rows)
+    conn.commit()
+
+
+def interrupt_after(batches):
+    # dedupe_attendance that dies after `batches` successful batches
+    calls = []
+
+    def batch(conn, after_id, limit):
+        if len(calls) == batches:
+            raise Interrupted()
+        calls.append(after_id)
+        return migrations.dedupe_attendance(conn, after_id, limit)
+
+    number, description, apply, _batch = migrations.MIGRATIONS[2]
+    patched = list(migrations.MIGRATIONS)
+    patched[2] = (number, description, apply, batch)
+    return mock.patch.object(migrations, "MIGRATIONS", patched)
+
+
+class ResumableDedupeTest(unittest.TestCase):
+    def records(self, conn):
+        return conn.execute("SELECT student_id, date, status FROM attendance ORDER BY student_id, date").fetchall()
+
+    def test_resumes_after_interruption(self):
+        conn = version_2_db()
+        add_rows(conn, [(i % 3, f"2024-01-0{1 + i % 2}", f"v{i}") for i in range(20)])
+
+        with interrupt_after(2), self.assertRaises(Interrupted):
+            migrations.migrate(conn, batch_size=5)
+        self.assertEqual(migrations.current_version(conn), 2)
+        self.assertEqual(conn.execute("SELECT last_id FROM migration_progress").fetchone(), (10,))
+
+        self.assertEqual(migrations.migrate(conn, batch_size=5), [3, 4])
+        self.assertEqual(migrations.current_version(conn), migrations.LATEST)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM migration_progress").fetchone(), (0,))
+        # Newest value of each (student_id, date) survives
+        self.assertEqual(self.records(conn), [
+            (0, "2024-01-01", "v18"), (0, "2024-01-02", "v15"),
+            (1, "2024-01-01", "v16"), (1, "2024-01-02", "v19"),
+            (2, "2024-01-01", "v14"), (2, "2024-01-02", "v17"),
+        ])
+
+    def test_write_between_batches_duplicates_processed_row(self):
+        conn = version_2_db()
+        add_rows(conn, [(1, "2024-01-01", "Present")] + [(n, "2024-01-02", "Present") for n in range(2, 11)])
+
+        # The first batch covers ids 1-5, then the app saves student 1 again
+        with interrupt_after(1), self.assertRaises(Interrupted):
+            migrations.migrate(conn, batch_size=5)
+        add_rows(conn, [(1, "2024-01-01", "Absent")])
+
+        migrations.migrate(conn, batch_size=5)
+        self.assertEqual(migrations.current_version(conn), migrations.LATEST)
+        rows = conn.execute("SELECT status FROM attendance WHERE student_id=1 AND date='2024-01-01'").fetchall()
+        self.assertEqual(rows, [("Absent",)])
+        with self.assertRaises(sqlite3.IntegrityError):
+            add_rows(conn, [(1, "2024-01-01", "Present")])
+
+    def test_write_after_all_batches(self):
+        conn = version_2_db()
+        add_rows(conn, [(1, "2024-01-01", "Present"), (2, "2024-01-01", "Present")])
+
+        # Every batch has run, but the final transaction has not
+        migrations._run_batches(conn, 3, migrations.dedupe_attendance, 5)
+        add_rows(conn, [(1, "2024-01-01", "Absent"), (1, "2024-01-01", "Present")])
+
+        migrations.migrate(conn, batch_size=5)
+        self.assertEqual(self.records(conn), [(1, "2024-01-01", "Present"), (2, "2024-01-01", "Present")])
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM attendance").fetchone(), (2,))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import sqlite3
+import unittest
+
+import migrations
+import plan_check
+
+
+def seeded(drop_index=None):
+    conn = sqlite3.connect(":memory:")
+    migrations.migrate(conn)
+    if drop_index:
+        conn.execute(f"DROP INDEX {drop_index}")
+    plan_check.seed(conn)
+    return conn
+
+
+class QueryPlanTest(unittest.TestCase):
+    def test_every_statement_uses_its_indexes(self):
+        self.assertEqual(plan_check.check(seeded()), [])
+
+    def test_missing_date_index_is_reported(self):
+        failed = {name for name, _detail in plan_check.check(seeded("idx_attendance_date"))}
+        self.assertIn("WORKING_DAYS_IN_RANGE", failed)
+        self.assertIn("ATTENDANCE_EXPORT_IN_RANGE", failed)
+
+    def test_skip_scan_is_reported(self):
+        # Without it, section lookups skip-scan idx_students_class
+        failed = {name for name, _detail in plan_check.check(seeded("idx_students_section"))}
+        self.assertIn("STUDENTS_BY_SECTION", failed)
+        self.assertIn("STUDENT_IDS_BY_SECTION", failed)
+
+    def test_old_style_scan_details(self):
+        # SQLite before 3.36 prints "SCAN TABLE <table> [AS <alias>]"
+        m = plan_check.SCAN_RE.match("SCAN TABLE classes AS c")
+        self.assertEqual(m.group(2) or m.group(1), "c")
+        m = plan_check.SCAN_RE.match("SCAN TABLE classes")
+        self.assertEqual(m.group(2) or m.group(1), "classes")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import sqlite3
+import unittest
+
+import db
+import migrations
+import reports
+
+
+def school():
+    """Two classes with sections A/B; some students use legacy section names."""
+    conn = sqlite3.connect(":memory:")
+    migrations.migrate(conn)
+    conn.executemany(db.CLASS_INSERT, [("1",), ("2",)])
+    conn.executemany(db.SECTION_INSERT, [(1, "A"), (1, "B"), (2, "A")])
+    conn.executemany("INSERT INTO students(id, name, class_id, section_id) VALUES(?,?,?,?)", [
+        (1, "Asha", 1, 1),
+        (2, "Ben", 1, 2),
+        # Written by the old add_student: section name instead of its id
+        (3, "Cara", 1, "A"),
+        (4, "Dev", 1, "B"),
+        # Section "A" of class 2 must not match class 1's section "A"
+        (5, "Esi", 2, "A"),
+    ])
+    conn.executemany(db.ATTENDANCE_INSERT, [
+        (1, "2024-03-01", "Present"), (1, "2024-03-02", "Absent"),
+        (3, "2024-03-01", "Present"), (3, "2024-03-02", "Present"),
+        (5, "2024-03-01", "Absent"),
+    ])
+    conn.commit()
+    return conn
+
+
+class PeriodTest(unittest.TestCase):
+    def setUp(self):
+        self.conn = school()
+        reports.add_term(self.conn, "Term 1", "2024-1-8", "2024-03-29")
+
+    def test_spec_forms(self):
+        cases = {
+            "2024": ("2024-01-01", "2025-01-01"),
+            "2024-02": ("2024-02-01", "2024-03-01"),
+            "2024-12": ("2024-12-01", "2025-01-01"),
+            "2024-W05": ("2024-01-29", "2024-02-05"),
+            "2024-03-01:2024-03-31": ("2024-03-01", "2024-04-01"),
+            "2024-03-01..2024-03-31": ("2024-03-01", "2024-04-01"),
+            " Term 1 ": ("2024-01-08", "2024-03-30"),
+        }
+        for spec, bounds in cases.items():
+            with self.subTest(spec=spec):
+                self.assertEqual(reports.resolve_period(self.conn, spec), bounds)
+
+    def test_invalid_specs(self):
+        for spec in ("2024-13", "2024-00", "2024-W54", "2024-W00", "Term 9",
+                     "2024-03-31:2024-03-01", "2024-02-30:2024-03-01"):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    reports.resolve_period(self.conn, spec)
+
+    def test_date_range_normalises(self):
+        self.assertEqual(reports.date_range("2024-1-8", " 2024-1-8 "), ("2024-01-08", "2024-01-09"))
+        self.assertEqual(reports.date_range("2024-02-28", "2024-02-29"), ("2024-02-28", "2024-03-01"))
+        with self.assertRaises(ValueError):
+            reports.date_range("2024-01-09", "2024-01-08")
+
+
+class ScopeTest(unittest.TestCase):
+    def test_class_scope(self):
+        days, rows = reports.attendance_report(school(), "class", 1, "2024-03-01", "2024-04-01")
+        self.assertEqual(days, 2)
+        self.assertEqual(rows, [
+            (1, "Asha", "A", 2, 1, 1, 50.0),
+            (3, "Cara", "A", 2, 2, 0, 100.0),
+            (2, "Ben", "B", 0, 0, 2, 0.0),
+            (4, "Dev", "B", 0, 0, 2, 0.0),
+        ])
+
+    def test_student_scope(self):
+        conn = school()
+        _days, rows = reports.attendance_report(conn, "student", 3, "2024-03-01", "2024-04-01")
+        self.assertEqual(rows, [(3, "Cara", "A", 2, 2, 0, 100.0)])
+        _days, rows = reports.attendance_report(conn, "student", 99, "2024-03-01", "2024-04-01")
+        self.assertEqual(rows, [])
+
+    def test_range_excludes_end(self):
+        days, rows = reports.attendance_report(school(), "student", 1, "2024-03-01", "2024-03-02")
+        self.assertEqual(days, 1)
+        self.assertEqual(rows, [(1, "Asha", "A", 1, 1, 0, 100.0)])
+
+    def test_unknown_scope(self):
+        with self.assertRaises(ValueError):
+            reports.attendance_report(school(), "school", 1, "2024-03-01", "2024-04-01")
+
+
+class SectionScopeTest(unittest.TestCase):
+    def test_section_matches_id_and_legacy_name(self):
+        conn = school()
+        days, rows = reports.attendance_report(conn, "section", 1, "2024-03-01", "2024-04-01")
+        self.assertEqual(days, 2)
+        self.assertEqual(rows, [
+            (1, "Asha", "A", 2, 1, 1, 50.0),
+            (3, "Cara", "A", 2, 2, 0, 100.0),
+        ])
+
+    def test_legacy_name_does_not_leak_across_classes(self):
+        conn = school()
+        _days, rows = reports.attendance_report(conn, "section", 3, "2024-03-01", "2024-04-01")
+        self.assertEqual([r[1] for r in rows], ["Esi"])
+
+
+if __name__ == "__main__":
+    unittest.main()